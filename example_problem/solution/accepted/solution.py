@@ -1,26 +1,38 @@
 #!/usr/bin/env python3
+import sys
 
-def solve():
-    # 读取输入数据
-    m = int(input())
-    numbers = list(map(int, input().split()))
-    
-    # 对数组进行排序（从大到小）
-    sorted_numbers = sorted(numbers, reverse=True)
-    
-    # 创建一个字典，存储每个数字在排序后的位置（1开始计数）
-    positions = {num: idx + 1 for idx, num in enumerate(sorted_numbers)}
-    
-    # 处理查询
-    n = int(input())
-    for _ in range(n):
-        query = int(input())
-        
-        # 查找位置并输出
-        if query in positions:
-            print(positions[query])
+# 元素个数达到这个值时，如果可以使用 NumPy，就用 NumPy 排序（导入 NumPy 本身也需要时间）
+NUMPY_THRESHOLD = 10 ** 4
+
+def build_positions(tokens):
+    # 创建一个字典，存储每个数字在从大到小排序后的位置（1开始计数）
+    if len(tokens) >= NUMPY_THRESHOLD:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
         else:
-            print("-1")
+            arr = np.array(tokens).astype(np.int64)
+            # 稳定排序，使相同的数字得到和下面的实现相同的位置
+            order = np.argsort(-arr, kind='stable')
+            return dict(zip(arr[order].tolist(), range(1, len(tokens) + 1)))
+
+    # 对数组进行排序（从大到小）
+    sorted_numbers = sorted(map(int, tokens), reverse=True)
+    return {num: idx + 1 for idx, num in enumerate(sorted_numbers)}
+
+def solve():
+    # 一次性读取全部输入数据，避免逐行调用 input()
+    data = sys.stdin.buffer.read().split()
+    m = int(data[0])
+    numbers = data[1:1 + m]
+    n = int(data[1 + m])
+    queries = data[2 + m:2 + m + n]
+
+    # 处理查询，查找位置（找不到时为 -1），并一次性输出
+    positions = build_positions(numbers)
+    answers = [positions.get(int(query), -1) for query in queries]
+    sys.stdout.write("".join(f"{answer}\n" for answer in answers))
 
 if __name__ == "__main__":
-    solve() 
\ No newline at end of file
+    solve()
@@ -108,8 +108,15 @@ def run(args: argparse.Namespace) -> bool:
         # 创建验证器参数对象
         validator_args = argparse.Namespace()
         # 使用在 validator.py 中定义的参数
+        validator_args.dir = args.dir
+        validator_args.test = None
         validator_args.validator = None  # 让 validator.py 使用默认验证器
+        validator_args.jobs = None
+        validator_args.limit = None
+        validator_args.batch = False
         validator_args.silent = False
+        validator_args.summary_only = False
+        validator_args.verbose = args.verbose
         validator_args.only_sample = False
         validator_args.only_secret = False
         
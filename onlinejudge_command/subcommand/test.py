@@ -156,8 +156,8 @@ def build_match_function(*, compare_mode: CompareMode, error: Optional[float], j
         
         if not result:
             logger.debug("Comparison failed:")
-            logger.debug(f"Expected: {expected_clean}")
-            logger.debug(f"Actual: {actual_clean}")
+            logger.debug("Expected: %s", expected_clean)
+            logger.debug("Actual: %s", actual_clean)
             
             # 如果精确比较失败，但是启用了宽松比较，给出提示
             if is_exact:
@@ -193,12 +193,12 @@ def run_checking_output(*, answer: bytes, test_output_path: Optional[pathlib.Pat
                 
                 if not result:
                     logger.debug("Output comparison failed:")
-                    logger.debug(f"Expected: {expected}")
-                    logger.debug(f"Actual: {trimmed_answer}")
+                    logger.debug("Expected: %s", expected)
+                    logger.debug("Actual: %s", trimmed_answer)
                 
                 return result
         except Exception as e:
-            logger.error(f"Error reading expected output file: {e}")
+            logger.error("Error reading expected output file: %s", e)
             return False
     else:
         # only if --judge option
@@ -300,7 +300,7 @@ def test_single_case(test_name: str, test_input_path: pathlib.Path, test_output_
             input_content = inf.read().strip()
         logger.info('Test input:%s', " " + input_content if input_content else " <empty>")
     except Exception as e:
-        logger.error(f"Error reading input file: {e}")
+        logger.error("Error reading input file: %s", e)
 
     # run the binary
     with test_input_path.open('rb') as inf:
@@ -337,7 +337,7 @@ def test_single_case(test_name: str, test_input_path: pathlib.Path, test_output_
                     expected_output = outf.read().strip()
                 logger.info('Expected output:%s', " " + expected_output if expected_output else " <empty>")
             except Exception as e:
-                logger.error(f"Error reading expected output file: {e}")
+                logger.error("Error reading expected output file: %s", e)
 
         match_function = build_match_function(compare_mode=CompareMode(args.compare_mode), error=args.error, judge_command=args.judge, silent=args.silent, test_input_path=test_input_path, test_output_path=test_output_path)
         match_result = run_checking_output(answer=answer.encode(), test_output_path=test_output_path, is_special_judge=args.judge is not None, match_function=match_function)
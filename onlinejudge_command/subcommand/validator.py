@@ -1,52 +1,291 @@
 import argparse
-import glob
+import concurrent.futures
+import contextlib
+import functools
+import itertools
 import os
 import pathlib
+import stat
+import subprocess
 import sys
+import threading
+import urllib.parse
+from logging import getLogger
 from typing import *
 
 import onlinejudge_command.utils as utils
 
-# 尝试导入rich库，如果不可用则使用基本输出
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich import box
-    HAS_RICH = True
-except ImportError:
-    HAS_RICH = False
+logger = getLogger(__name__)
 
-def add_subparser(subparsers: argparse.Action) -> None:
-    subparser = subparsers.add_parser(
-        'validator',
-        aliases=['v'],
-        help='validate test cases using input validators',
-        formatter_class=argparse.RawTextHelpFormatter,
-        epilog='''\
+
+@functools.lru_cache(maxsize=None)
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _exists(path: pathlib.Path) -> bool:
+    """_exists is `path.exists()` backed by a cache of `os.stat()`, because run() probes the same paths several times. The cache is cleared at the start of each run()."""
+
+    return _stat(str(path)) is not None
+
+
+def _is_dir(path: pathlib.Path) -> bool:
+    st = _stat(str(path))
+    return st is not None and stat.S_ISDIR(st.st_mode)
+
+
+def _is_executable(path: pathlib.Path) -> bool:
+    """_is_executable checks the execute bits of the mode instead of `os.access()`, so it reuses the cached `os.stat()` and does not depend on the real UID."""
+
+    st = _stat(str(path))
+    return st is not None and bool(st.st_mode & 0o111)
+
+
+def _list_files(directory: pathlib.Path, *, suffix: str = '') -> List[pathlib.Path]:
+    """_list_files lists regular files in `directory` whose names end with `suffix`, sorted by name.
+
+    This uses `os.scandir()` directly because `Path.glob()` wraps and re-stats every entry, which is slow for directories with thousands of test cases.
+    """
+
+    with os.scandir(directory) as it:
+        entries = [entry for entry in it if entry.name.endswith(suffix) and entry.is_file()]
+    entries.sort(key=lambda entry: entry.name)
+    return [pathlib.Path(entry.path) for entry in entries]
+
+
+def _find_subdirectories(directory: pathlib.Path, names: Iterable[str]) -> Dict[str, pathlib.Path]:
+    """_find_subdirectories finds the directories among `directory / name` with a single `os.scandir()`, instead of a `stat()` for each name."""
+
+    names = set(names)
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: pathlib.Path(entry.path) for entry in it if entry.name in names and entry.is_dir()}
+    except OSError:
+        return {}
+
+
+_EPILOG = '''\
 example:
     $ np v                     # validate all test cases in data/sample and data/secret directories
     $ np v --only-sample       # validate only test cases in data/sample
     $ np v --only-secret       # validate only test cases in data/secret
     $ np v --test=sample1.in   # validate a specific test case
-''',
-    )
-    subparser.add_argument('--dir', '-d', type=pathlib.Path, default=pathlib.Path('.'), help='specify the problem directory')
-    subparser.add_argument('--test', '-t', type=str, help='specify a specific test file to validate (provide filename only)')
-    subparser.add_argument('--validator', '-v', type=pathlib.Path, help='specify a specific validator script (default: all scripts in input_validators directory)')
-    subparser.add_argument('--only-sample', action='store_true', help='validate only sample test cases')
-    subparser.add_argument('--only-secret', action='store_true', help='validate only secret test cases')
+    $ np v --limit 10          # validate only the first 10 test cases
+    $ np v --validator ./input_validators/validate.py
+    $ np v -j 1                # run validations one by one
+    $ np v --batch             # feed all test files to one process per validator
+    $ np v --summary-only      # print only the numbers of passed and failed validations
+    $ np -v v                  # also show the stdout of validators as error messages
+
+batch protocol:
+  This is used for all validators with --batch, and for validators which contain a line "# oj-batch: 1" within their first 1 KiB.
+  The validator is started once with an extra "--batch" argument. Its stdin is a sequence of cases, each of which is a header line "CASE <name> <size>\\n" followed by exactly <size> bytes of the test file.
+  <name> is like "sample/1.in", percent-encoded as in URLs, so it never contains spaces (e.g. "sample/b c.in" is sent as "sample/b%20c.in"). Validators should echo it as it is.
+  The validator prints one line per case to stdout: "OK <name>" or "FAIL <name> <message>". Cases without a line are treated as invalid, and lines with unknown names are ignored.
+'''
+
+MAX_CACHED_INPUT_SIZE = 8 * 1024 * 1024  # in bytes
+MAX_SHARED_INPUT_TOTAL = 64 * 1024 * 1024  # in bytes
+
+
+def _non_negative_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError('must be a non-negative integer: {}'.format(value))
+    return number
+
+
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        raise argparse.ArgumentTypeError('must be a positive integer: {}'.format(value))
+    return number
+
+
+# An option is a pair of its names and the keyword arguments of add_argument()
+_Option = Tuple[Tuple[str, ...], Dict[str, Any]]
+
+# The options are built once at import time and only replayed in add_subparser().
+_ARGUMENTS: Tuple[_Option, ...] = (
+    (('--dir', '-d'), {
+        'type': pathlib.Path,
+        'default': pathlib.Path('.'),
+        'help': 'specify the problem directory'
+    }),
+    (('--test', '-t'), {
+        'type': str,
+        'help': 'specify a specific test file to validate (provide filename only)'
+    }),
+    (('--validator', '-v'), {
+        'type': pathlib.Path,
+        'help': 'specify a specific validator script (default: all scripts in input_validators directory)'
+    }),
+    (('--only-sample', ), {
+        'action': 'store_true',
+        'help': 'validate only sample test cases'
+    }),
+    (('--only-secret', ), {
+        'action': 'store_true',
+        'help': 'validate only secret test cases'
+    }),
+    (('-j', '--jobs'), {
+        'type': _positive_int,
+        'help': 'the number of validations to run in parallel (default: the number of CPUs)'
+    }),
+    (('--limit', ), {
+        'type': _non_negative_int,
+        'help': 'validate at most this many test files, in the order of data/sample, data/secret'
+    }),
+    (('--batch', ), {
+        'action': 'store_true',
+        'help': 'validate all test files with a single process per validator, using the batch protocol described below'
+    }),
+    (('--silent', ), {
+        'action': 'store_true',
+        'help': 'print only failures and the summary. The stderr of validators is discarded, so error messages are not shown'
+    }),
+    (('--summary-only', ), {
+        'action': 'store_true',
+        'help': 'print only the summary, without the results of each test file'
+    }),
+)
+
+
+def add_subparser(subparsers: argparse.Action) -> None:
+    subparser = subparsers.add_parser('validator', aliases=['v'], help='validate test cases using input validators', formatter_class=argparse.RawTextHelpFormatter, epilog=_EPILOG)
+    for names, kwargs in _ARGUMENTS:
+        subparser.add_argument(*names, **kwargs)
+
+
+def _build_command(validator: pathlib.Path) -> List[str]:
+    if validator.suffix != '.py':
+        return [str(validator)]
+
+    # -B stops writing .pyc files of modules which the validator imports. The site directory and the directory of the validator stay importable.
+    return [sys.executable, '-B', str(validator)]
+
+
+def _declares_batch(validator: pathlib.Path) -> bool:
+    """_declares_batch checks whether a validator opts in to the batch protocol with a "# oj-batch: 1" line near its top."""
+
+    try:
+        with open(validator, 'rb') as fh:
+            head = fh.read(1024)
+    except OSError:
+        return False
+    return any(line.strip() == b'# oj-batch: 1' for line in head.splitlines())
+
+
+def _validate_one(command: List[str], test_type: str, test_file: pathlib.Path, input_data: Optional[bytes] = None, *, capture_stdout: bool = False, capture_stderr: bool = True) -> Dict[str, Any]:
+    """_validate_one runs a validator on a single test file. This is called from worker threads, so it must not print logs.
+
+    :param input_data: the content of `test_file` if it is already in memory. If this is None, the file is streamed through stdin.
+    :param capture_stdout: use stdout as the error message when stderr is empty. Otherwise stdout is discarded, which saves a pipe and a reader thread per call.
+    :param capture_stderr: use stderr as the error message. Otherwise stderr is discarded too, and invalid files get no error message.
+    """
+
+    stdout = subprocess.PIPE if capture_stdout else subprocess.DEVNULL
+    stderr = subprocess.PIPE if capture_stderr else subprocess.DEVNULL
+    try:
+        if input_data is not None:
+            process = subprocess.run(command, input=input_data, stdout=stdout, stderr=stderr, check=False)
+        else:
+            with open(test_file, 'rb') as f:
+                process = subprocess.run(command, stdin=f, stdout=stdout, stderr=stderr, check=False)
+        is_valid = process.returncode == 0
+        error_message = '' if is_valid else (process.stderr or process.stdout or b'').decode(errors='replace').strip()
+    except Exception as e:
+        is_valid = False
+        error_message = 'Failed to validate: {}'.format(e)
+
+    return {
+        "test_type": test_type,
+        "name": test_file.name,
+        "file": str(test_file),
+        "is_valid": is_valid,
+        "error": error_message,
+    }
+
+
+def _validate_batch(command: List[str], test_files: List[Tuple[str, pathlib.Path]], load_input: Callable[[pathlib.Path], Optional[bytes]], *, capture_stderr: bool = True) -> List[Dict[str, Any]]:
+    """_validate_batch runs a validator once on all test files using the batch protocol, which saves the startup time of the validator for each file. This is called from worker threads, so it must not print logs."""
+
+    # Names are percent-encoded, because they are separated by spaces in the protocol
+    names = [urllib.parse.quote('{}/{}'.format(test_type, test_file.name)) for test_type, test_file in test_files]
+    payload = bytearray()
+    for name, (_, test_file) in zip(names, test_files):
+        data = load_input(test_file)
+        if data is None:
+            data = test_file.read_bytes()
+        payload += 'CASE {} {}\n'.format(name, len(data)).encode()
+        payload += data
+
+    # Lines for names which are not in this batch are ignored
+    known_names = set(names)
+    reported: Dict[str, str] = {}
+    stderr = b''
+    failure: Optional[str] = None
+    try:
+        # subprocess accepts any bytes-like input, so the payload is passed without copying it into a bytes object
+        process = subprocess.run(command + ['--batch'], input=payload, stdout=subprocess.PIPE, stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL, check=False)
+        for line in process.stdout.splitlines():
+            status, _, rest = line.partition(b' ')
+            name_bytes, _, message = rest.partition(b' ')
+            name = name_bytes.decode(errors='replace')
+            if name not in known_names:
+                continue
+            if status == b'OK':
+                reported[name] = ''
+            elif status == b'FAIL':
+                reported[name] = message.decode(errors='replace').strip() or 'rejected by the validator'
+        stderr = process.stderr or b''
+    except Exception as e:
+        failure = 'Failed to validate: {}'.format(e)
+
+    # stderr is decoded only when some case has no result
+    if failure is None and any(name not in reported for name in names):
+        failure = stderr.decode(errors='replace').strip() or 'no result was reported by the validator'
+
+    results = []
+    for name, (test_type, test_file) in zip(names, test_files):
+        error_message = reported.get(name, failure) or ''
+        results.append({
+            "test_type": test_type,
+            "name": test_file.name,
+            "file": str(test_file),
+            "is_valid": name in reported and not error_message,
+            "error": error_message,
+        })
+    return results
+
+
+def _run_job(command: List[str], test_files: List[Tuple[str, pathlib.Path]], *, load_input: Callable[[pathlib.Path], Optional[bytes]], batch: bool, capture_stdout: bool, capture_stderr: bool) -> List[Dict[str, Any]]:
+    if batch:
+        return _validate_batch(command, test_files, load_input, capture_stderr=capture_stderr)
+    return [_validate_one(command, test_type, test_file, load_input(test_file), capture_stdout=capture_stdout, capture_stderr=capture_stderr) for test_type, test_file in test_files]
 
 
 def run(args: argparse.Namespace) -> bool:
+    _stat.cache_clear()
+
     # Get the base problem directory
     problem_dir = args.dir
     
     # Find validators
     validator_dir = problem_dir / 'input_validators'
-    if not validator_dir.exists() and not args.validator:
+    if not _is_dir(validator_dir) and not args.validator:
         # Try old directory structure
         old_validator = problem_dir / 'validator.py'
-        if old_validator.exists():
+        if _exists(old_validator):
             logger.warning('Using old-style validator: %s', old_validator)
             validator_scripts = [old_validator]
         else:
@@ -55,112 +294,169 @@ def run(args: argparse.Namespace) -> bool:
     else:
         if args.validator:
             # Use specified validator
-            validator_scripts = [args.validator]
+            validator_scripts = [pathlib.Path(args.validator)]
+            if not _exists(validator_scripts[0]):
+                logger.error('Validator not found: %s', args.validator)
+                return False
         else:
             # Use all validators in the directory
-            validator_scripts = list(validator_dir.glob('*.py'))
+            validator_scripts = _list_files(validator_dir, suffix='.py')
             if not validator_scripts:
                 logger.warning('No Python validators found in: %s', validator_dir)
                 # Look for other executables
-                validator_scripts = [f for f in validator_dir.iterdir() 
-                                    if f.is_file() and os.access(f, os.X_OK)]
+                validator_scripts = [f for f in _list_files(validator_dir) if _is_executable(f)]
                 if not validator_scripts:
                     logger.error('No executable validators found in: %s', validator_dir)
                     return False
         
     # Make sure all validators are executable
     for validator in validator_scripts:
-        if not os.access(validator, os.X_OK):
+        st = _stat(str(validator))
+        if st is not None and not st.st_mode & 0o111:
             logger.warning('Validator script is not executable, making it executable: %s', validator)
-            os.chmod(validator, 0o755)
+            os.chmod(validator, stat.S_IMODE(st.st_mode) | 0o755)
     
-    # Find test directories
-    test_dirs = []
+    # Get the list of test files to validate
+    test_files: List[Tuple[str, pathlib.Path]] = []
+    new_style_dirs: List[Tuple[str, pathlib.Path]] = []
     if not args.only_secret:
-        sample_dir = problem_dir / 'data' / 'sample'
-        if sample_dir.exists():
-            test_dirs.append(('sample', sample_dir))
-    
+        new_style_dirs.append(('sample', problem_dir / 'data' / 'sample'))
     if not args.only_sample:
-        secret_dir = problem_dir / 'data' / 'secret'
-        if secret_dir.exists():
-            test_dirs.append(('secret', secret_dir))
-    
-    # If no new-style directories found, try old directory structure
-    if not test_dirs:
-        old_test_dir = problem_dir / 'test'
-        if old_test_dir.exists():
-            logger.warning('Using old-style test directory: %s', old_test_dir)
-            test_dirs.append(('test', old_test_dir))
-        else:
-            logger.error('No test directories found')
-            return False
+        new_style_dirs.append(('secret', problem_dir / 'data' / 'secret'))
+    old_test_dir = problem_dir / 'test'
     
-    # Get the list of test files to validate
-    test_files = []
     if args.test:
-        # Find specific test file in all test directories
-        found = False
-        for test_type, test_dir in test_dirs:
+        # Look up the specific test file directly. The test directories are neither checked nor scanned.
+        for test_type, test_dir in new_style_dirs:
             test_path = test_dir / args.test
-            if test_path.exists():
+            if _exists(test_path):
                 test_files.append((test_type, test_path))
-                found = True
+        if not test_files and _exists(old_test_dir / args.test):
+            logger.warning('Using old-style test directory: %s', old_test_dir)
+            test_files.append(('test', old_test_dir / args.test))
         
-        if not found:
+        if not test_files:
             logger.error('Test file not found: %s', args.test)
-            logger.info('Looked in: %s', ', '.join(str(d[1]) for d in test_dirs))
+            logger.info('Looked in: %s', ', '.join(str(d) for d in [test_dir for _, test_dir in new_style_dirs] + [old_test_dir]))
             return False
     else:
-        # Collect all test files from each directory
-        for test_type, test_dir in test_dirs:
-            dir_files = sorted(test_dir.glob('*.in'))
-            for f in dir_files:
-                test_files.append((test_type, f))
+        # Find test directories
+        found_dirs = _find_subdirectories(problem_dir / 'data', [test_type for test_type, _ in new_style_dirs])
+        test_dirs = [(test_type, found_dirs[test_type]) for test_type, _ in new_style_dirs if test_type in found_dirs]
+        
+        # If no new-style directories found, try old directory structure
+        if not test_dirs:
+            if _is_dir(old_test_dir):
+                logger.warning('Using old-style test directory: %s', old_test_dir)
+                test_dirs.append(('test', old_test_dir))
+            else:
+                logger.error('No test directories found')
+                return False
+        
+        # Collect test files from each directory lazily, so directories after --limit is reached are never scanned
+        def iterate_test_files() -> Iterator[Tuple[str, pathlib.Path]]:
+            for test_type, test_dir in test_dirs:
+                dir_files = _list_files(test_dir, suffix='.in')
+                logger.info('Found %d test files in %s', len(dir_files), test_dir)
+                for f in dir_files:
+                    yield (test_type, f)
+        
+        test_files.extend(itertools.islice(iterate_test_files(), args.limit))
         
         if not test_files:
             logger.warning('No test files found in any directory')
             return True
     
     # Validate each test file with each validator
+    jobs: List[Tuple[List[str], List[Tuple[str, pathlib.Path]], bool]] = []
+    for validator in validator_scripts:
+        logger.info('Using validator: %s', validator)
+        command = _build_command(validator)
+        if args.batch or _declares_batch(validator):
+            jobs.append((command, test_files, True))
+        else:
+            for test_file in test_files:
+                jobs.append((command, [test_file], False))
+
+    # With several validators, each file would otherwise be read once per validator. A file is read by the worker of its first job, so reading overlaps with the validators which are already running.
+    # A shared file is dropped as soon as every validator has loaded it, and no more files are kept while MAX_SHARED_INPUT_TOTAL bytes are kept. Large files are always streamed.
+    share_inputs = len(validator_scripts) >= 2
+    remaining_uses: Dict[pathlib.Path, int] = {}
+    shared_inputs: Dict[pathlib.Path, bytes] = {}
+    shared_size = 0
+    shared_inputs_lock = threading.Lock()
+
+    def load_input(test_file: pathlib.Path) -> Optional[bytes]:
+        nonlocal shared_size
+        if not share_inputs:
+            return None
+        # Each validator loads each file exactly once, either in its job of the file or in its batch job
+        with shared_inputs_lock:
+            remaining = remaining_uses.get(test_file, len(validator_scripts)) - 1
+            remaining_uses[test_file] = remaining
+            data = shared_inputs.get(test_file)
+            if data is not None:
+                if remaining == 0:
+                    del shared_inputs[test_file]
+                    shared_size -= len(data)
+                return data
+        st = _stat(str(test_file))
+        if st is None or st.st_size > MAX_CACHED_INPUT_SIZE:
+            return None
+        # The file is read outside of the lock, so other workers are not blocked. Two workers may read the same file at the same time, and then only one copy is kept.
+        data = test_file.read_bytes()
+        with shared_inputs_lock:
+            if remaining_uses[test_file] > 0 and test_file not in shared_inputs and shared_size + len(data) <= MAX_SHARED_INPUT_TOTAL:
+                shared_inputs[test_file] = data
+                shared_size += len(data)
+        return data
+
     all_success = True
-    total_tests = len(test_files) * len(validator_scripts)
     success_count = 0
     failure_count = 0
     
-    for validator in validator_scripts:
-        logger.info('Using validator: %s', validator)
-        
-        for test_type, test_file in test_files:
-            logger.info('Validating %s: %s', test_type, test_file.name)
-            
-            try:
-                # Run the validator on the test file
-                with open(test_file, 'r') as f:
-                    input_data = f.read()
-                    
-                process = subprocess.run(
-                    [str(validator)],
-                    input=input_data,
-                    text=True,
-                    capture_output=True,
-                    check=False
-                )
-                
-                if process.returncode == 0:
-                    logger.info('[SUCCESS] %s/%s is valid', test_type, test_file.name)
+    # Error messages are never printed with --silent or --summary-only, so the output of validators is not even piped back
+    capture_output = not (args.silent or args.summary_only)
+
+    def run_job(index: int) -> Tuple[int, List[Dict[str, Any]]]:
+        command, job_test_files, batch = jobs[index]
+        return index, _run_job(command, job_test_files, load_input=load_input, batch=batch, capture_stdout=capture_output and args.verbose, capture_stderr=capture_output)
+    
+    # Store validation results for table display, in the order of jobs
+    results_by_job: List[List[Dict[str, Any]]] = [[] for _ in jobs]
+    
+    max_workers = min(len(jobs), args.jobs or os.cpu_count() or 1)
+    with contextlib.ExitStack() as stack:
+        if max_workers <= 1:
+            completed: Iterable[Tuple[int, List[Dict[str, Any]]]] = (run_job(index) for index in range(len(jobs)))
+        else:
+            executor = stack.enter_context(concurrent.futures.ThreadPoolExecutor(max_workers=max_workers))
+            futures = [executor.submit(run_job, index) for index in range(len(jobs))]
+            completed = (future.result() for future in concurrent.futures.as_completed(futures))
+
+        # Results are reported as soon as they complete. Only this thread prints logs, so the lines of different results are never interleaved.
+        for index, results in completed:
+            if args.summary_only:
+                # Only the numbers are needed, so the results are neither logged nor kept for the table
+                failed = sum(1 for result in results if not result["is_valid"])
+                success_count += len(results) - failed
+                failure_count += failed
+                all_success = all_success and not failed
+                continue
+            for result in results:
+                if result["is_valid"]:
+                    if not args.silent:
+                        logger.info('[SUCCESS] %s/%s is valid', result["test_type"], result["name"])
                     success_count += 1
                 else:
-                    logger.error('[FAILURE] %s/%s is invalid', test_type, test_file.name)
-                    if process.stderr:
-                        logger.error('Error message: %s', process.stderr.strip())
+                    logger.error('[FAILURE] %s/%s is invalid', result["test_type"], result["name"])
+                    if result["error"]:
+                        logger.error('Error message: %s', result["error"])
                     failure_count += 1
                     all_success = False
-            
-            except Exception as e:
-                logger.error('[ERROR] Failed to validate %s/%s: %s', test_type, test_file.name, str(e))
-                failure_count += 1
-                all_success = False
+            results_by_job[index] = results
+    
+    validation_results = list(itertools.chain.from_iterable(results_by_job))
     
     # Print summary
     logger.info('')
@@ -168,119 +464,25 @@ def run(args: argparse.Namespace) -> bool:
     logger.info('  %d test files validated with %d validators', len(test_files), len(validator_scripts))
     logger.info('  %d validations passed, %d validations failed', success_count, failure_count)
     
-    return all_success 
-    subparser = subparsers.add_parser('validator', aliases=['v'], help='validate input files', formatter_class=argparse.RawTextHelpFormatter, epilog='''\
-validate input files using the specified validator
-
-example:
-    $ np validator
-    $ np validator --validator ./input_validators/validate.py
-    $ np validator --only-sample  # 只检测data/sample目录
-    $ np validator --only-secret  # 只检测data/secret目录
-''')
-    subparser.add_argument('--validator', default='./input_validators/validate.py', help='validator program (default: "./input_validators/validate.py")')
-    subparser.add_argument('--silent', action='store_true', help='silent mode')
-    subparser.add_argument('--only-sample', action='store_true', help='only validate files in the data/sample directory')
-    subparser.add_argument('--only-secret', action='store_true', help='only validate files in the data/secret directory')
-    subparser.set_defaults(func=run)
-
-
-def run(args: argparse.Namespace) -> bool:
-    # find input files
-    input_paths: List[pathlib.Path] = []
-    
-    # Check data/sample directory if not --only-secret
-    if not args.only_secret:
-        sample_dir = pathlib.Path('data/sample')
-        if sample_dir.exists() and sample_dir.is_dir():
-            sample_files = sorted(sample_dir.glob('*.in'))
-            input_paths.extend(sample_files)
-            utils.logger.info('Found {} test files in data/sample directory'.format(len(sample_files)))
-        else:
-            utils.logger.warning('data/sample directory doesn\'t exist')
-    
-    # Check data/secret directory if not --only-sample
-    if not args.only_sample:
-        secret_dir = pathlib.Path('data/secret')
-        if secret_dir.exists() and secret_dir.is_dir():
-            secret_files = sorted(secret_dir.glob('*.in'))
-            input_paths.extend(secret_files)
-            utils.logger.info('Found {} test files in data/secret directory'.format(len(secret_files)))
-        else:
-            utils.logger.warning('data/secret directory doesn\'t exist')
-    
-    if not input_paths:
-        utils.logger.error('no input files found')
-        return False
-    
-    # validate input files
-    if args.validator is None:
-        args.validator = './input_validators/validate.py'  # Set default if None
-        utils.logger.info('Using default validator: {}'.format(args.validator))
-
-    validator = pathlib.Path(args.validator)
-    if not validator.exists():
-        utils.logger.error('validator: {} doesn\'t exist'.format(validator))
-        return False
-    
-    # Make sure the validator is executable
-    if not os.access(validator, os.X_OK):
-        utils.logger.warning('validator script is not executable, making it executable: {}'.format(validator))
-        os.chmod(validator, 0o755)
-    
-    valid_count = 0
-    invalid_count = 0
-    
-    # Store validation results for table display
-    validation_results = []
-    
-    for path in input_paths:
-        utils.logger.info('validating: {}'.format(path))
-        
-        # Run the validator with python interpreter
-        command = ["python3", str(validator)]
-        with open(str(path)) as inf:
-            result = utils.subprocess.run(command, stdin=inf, capture_output=True, text=True, check=False)
-        
-        is_valid = result.returncode == 0
-        error_message = ""
-        
-        if is_valid:
-            utils.logger.info('valid: {}'.format(path))
-            valid_count += 1
-        else:
-            # 收集错误信息
-            if result.stderr:
-                error_message = result.stderr.strip()
-                utils.logger.error(error_message)
-            elif result.stdout:
-                error_message = result.stdout.strip()
-                utils.logger.error(error_message)
-            
-            utils.logger.error('invalid: {}'.format(path))
-            invalid_count += 1
-        
-        validation_results.append({
-            "file": str(path),
-            "is_valid": is_valid,
-            "error": error_message
-        })
-    
-    # Print summary
-    utils.logger.info('validation summary: {} valid file(s) and {} invalid file(s)'.format(valid_count, invalid_count))
-    
-    # Print table visualization
-    if validation_results:
-        if HAS_RICH:
+    # Print table visualization. rich is imported only here, so --silent runs never pay for it.
+    if validation_results and not args.silent and not args.summary_only:
+        try:
             print_rich_table(validation_results)
-        else:
+        except ImportError:
             print_basic_table(validation_results)
     
-    return invalid_count == 0
+    return all_success
 
 
 def print_rich_table(results: List[Dict[str, Any]]) -> None:
-    """Print validation results in a rich table format."""
+    """Print validation results in a rich table format.
+
+    :raises ImportError: if rich is not installed
+    """
+    from rich import box  # pylint: disable=import-outside-toplevel
+    from rich.console import Console  # pylint: disable=import-outside-toplevel
+    from rich.table import Table  # pylint: disable=import-outside-toplevel
+
     console = Console()
     
     table = Table(title="Validation Results", box=box.ROUNDED)
@@ -294,7 +496,6 @@ def print_rich_table(results: List[Dict[str, Any]]) -> None:
     for result in results:
         file_name = result["file"]
         status = "✓ Valid" if result["is_valid"] else "✗ Invalid"
-        status_style = "green" if result["is_valid"] else "red"
         error = result.get("error", "")
         
         # Truncate error message if too long
@@ -314,38 +515,40 @@ def print_rich_table(results: List[Dict[str, Any]]) -> None:
 
 def print_basic_table(results: List[Dict[str, Any]]) -> None:
     """Print validation results in a basic table format."""
-    # Find the maximum width for each column
-    max_file_width = max(len(result["file"]) for result in results)
-    max_file_width = max(max_file_width, len("File"))
+    # Find the maximum width for each column in a single pass. Error messages are cut at 50 characters, which is the limit of the column width anyway.
+    max_file_width = len("File")
     max_status_width = max(len("✓ Valid"), len("✗ Invalid"))
-    
-    # 计算错误消息的最大宽度，但限制在合理范围内
-    error_messages = [result.get("error", "") for result in results]
-    max_error_width = max(len(msg) for msg in error_messages) if error_messages else 0
-    max_error_width = max(max_error_width, len("Error Message"))
-    max_error_width = min(max_error_width, 50)  # 限制错误消息宽度
+    max_error_width = len("Error Message")
+    rows = []
+    for result in results:
+        file_name = result["file"]
+        error = (result.get("error") or "")[:50]
+        max_file_width = max(max_file_width, len(file_name))
+        max_error_width = max(max_error_width, len(error))
+        rows.append((file_name, "✓ Valid" if result["is_valid"] else "✗ Invalid", error))
     
     # Calculate total table width
     total_width = max_file_width + max_status_width + max_error_width + 10  # 10 for padding and separators
     
-    # Print table header
-    utils.logger.info("╭" + "─" * total_width + "╮")
-    utils.logger.info("│ Validation Results" + " " * (total_width - 19) + "│")
-    utils.logger.info("├" + "─" * max_file_width + "┬" + "─" * max_status_width + "┬" + "─" * max_error_width + "┤")
-    utils.logger.info("│ " + "File".ljust(max_file_width - 1) + "│ " + "Status".ljust(max_status_width - 1) + "│ " + "Error Message".ljust(max_error_width - 1) + "│")
-    utils.logger.info("├" + "─" * max_file_width + "┼" + "─" * max_status_width + "┼" + "─" * max_error_width + "┤")
+    # Build the whole table and emit it with a single logging call. The horizontal rules of the columns are shared by the separator lines.
+    file_rule = "─" * max_file_width
+    status_rule = "─" * max_status_width
+    error_rule = "─" * max_error_width
+    row_format = "│ {{:<{}}}│ {{:<{}}}│ {{:<{}}}│".format(max_file_width - 1, max_status_width - 1, max_error_width - 1)
+    lines = [
+        "╭" + "─" * total_width + "╮",
+        "│ Validation Results" + " " * (total_width - 19) + "│",
+        "├" + file_rule + "┬" + status_rule + "┬" + error_rule + "┤",
+        row_format.format("File", "Status", "Error Message"),
+        "├" + file_rule + "┼" + status_rule + "┼" + error_rule + "┤",
+    ]
     
-    # Print table rows
-    for result in results:
-        file_name = result["file"]
-        status = "✓ Valid" if result["is_valid"] else "✗ Invalid"
-        error = result.get("error", "")
-        
+    for file_name, status, error in rows:
         # Truncate error message if too long
         if len(error) > max_error_width - 1:
             error = error[:max_error_width - 4] + "..."
         
-        utils.logger.info("│ " + file_name.ljust(max_file_width - 1) + "│ " + status.ljust(max_status_width - 1) + "│ " + error.ljust(max_error_width - 1) + "│")
+        lines.append(row_format.format(file_name, status, error))
     
-    # Print table footer
-    utils.logger.info("╰" + "─" * max_file_width + "┴" + "─" * max_status_width + "┴" + "─" * max_error_width + "╯") 
+    lines.append("╰" + file_rule + "┴" + status_rule + "┴" + error_rule + "╯")
+    logger.info(utils.NO_HEADER + "\n".join(lines))
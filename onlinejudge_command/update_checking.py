@@ -5,11 +5,13 @@ from logging import getLogger
 from typing import *
 
 import packaging.version
-import requests
 
 import onlinejudge_command.__about__ as version
 from onlinejudge_command.utils import user_cache_dir
 
+if TYPE_CHECKING:
+    import requests
+
 logger = getLogger(__name__)
 
 
@@ -17,7 +19,7 @@ def describe_status_code(status_code: int) -> str:
     return '{} {}'.format(status_code, http.client.responses[status_code])
 
 
-def request(method: str, url: str, session: requests.Session, raise_for_status: bool = True, **kwargs) -> requests.Response:
+def request(method: str, url: str, session: 'requests.Session', raise_for_status: bool = True, **kwargs) -> 'requests.Response':
     assert method in ['GET', 'POST']
     kwargs.setdefault('allow_redirects', True)
     logger.info('%s: %s', method, url)
@@ -33,6 +35,8 @@ def request(method: str, url: str, session: requests.Session, raise_for_status:
 
 
 def get_latest_version_from_pypi(package_name: str) -> str:
+    import requests  # pylint: disable=import-outside-toplevel
+
     pypi_url = 'https://pypi.org/pypi/{}/json'.format(package_name)
     version_cache_path = user_cache_dir() / "pypi.json"
     update_interval = 60 * 60 * 8  # 8 hours
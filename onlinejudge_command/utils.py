@@ -1,26 +1,25 @@
 import contextlib
 import datetime
 import functools
-import http.cookiejar
 import os
 import pathlib
 import platform
-import shlex
+import shutil
 import signal
 import subprocess
 import sys
-import tempfile
 import time
-import webbrowser
 from logging import getLogger
 from typing import *
 from typing import BinaryIO  # It seems we cannot import BinaryIO with wildcard-import
 
 import colorama
-import requests
 
 import onlinejudge_command.__about__ as version
 
+if TYPE_CHECKING:
+    import requests
+
 logger = getLogger(__name__)
 
 # These strings can control logging output.
@@ -29,41 +28,61 @@ HINT = 'HINT: '
 SUCCESS = 'SUCCESS: '
 FAILURE = 'FAILURE: '
 
+@functools.lru_cache(maxsize=1)
+def _uname() -> platform.uname_result:
+    return platform.uname()
+
+
+@functools.lru_cache(maxsize=1)
+def _system() -> str:
+    return _uname().system
+
+
 # Define our own utility functions instead of importing from onlinejudge
 def user_data_dir() -> pathlib.Path:
     """Returns a directory path for user-specific data files."""
-    if platform.system() == 'Windows':
+    if _system() == 'Windows':
         return pathlib.Path(os.environ.get('APPDATA', os.path.expanduser('~\\AppData\\Roaming'))) / 'np-problem-tools'
-    elif platform.system() == 'Darwin':  # macOS
+    elif _system() == 'Darwin':  # macOS
         return pathlib.Path(os.path.expanduser('~/Library/Application Support/np-problem-tools'))
     else:
         return pathlib.Path(os.environ.get('XDG_DATA_HOME', os.path.expanduser('~/.local/share'))) / 'np-problem-tools'
 
 def user_cache_dir() -> pathlib.Path:
     """Returns a directory path for user-specific cache files."""
-    if platform.system() == 'Windows':
+    if _system() == 'Windows':
         return pathlib.Path(os.environ.get('LOCALAPPDATA', os.path.expanduser('~\\AppData\\Local'))) / 'np-problem-tools' / 'Cache'
-    elif platform.system() == 'Darwin':  # macOS
+    elif _system() == 'Darwin':  # macOS
         return pathlib.Path(os.path.expanduser('~/Library/Caches/np-problem-tools'))
     else:
         return pathlib.Path(os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))) / 'np-problem-tools'
 
 default_cookie_path = user_data_dir() / 'cookie.jar'
 
+# Directories of cookie files which are known to exist. `Path.mkdir(parents=True)` stats every ancestor again, so it is called only once per directory in a process.
+_created_cookie_dirs: Set[pathlib.Path] = set()
+
 @contextlib.contextmanager
-def with_cookiejar(session: requests.Session, *, path: pathlib.Path) -> Iterator[requests.Session]:
+def with_cookiejar(session: 'requests.Session', *, path: pathlib.Path) -> Iterator['requests.Session']:
     """Add a cookiejar to a requests.Session and save it when the context is exited."""
+    import http.cookiejar  # pylint: disable=import-outside-toplevel
     session.cookies = http.cookiejar.LWPCookieJar(str(path))
-    if path.exists():
+    if os.path.exists(path):
         logger.info('load cookie from: %s', path)
         session.cookies.load(ignore_discard=True)
     yield session
     logger.info('save cookie to: %s', path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.parent not in _created_cookie_dirs:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _created_cookie_dirs.add(path.parent)
     session.cookies.save(ignore_discard=True)
 
 @contextlib.contextmanager
-def new_session_with_our_user_agent(*, path: pathlib.Path) -> Iterator[requests.Session]:
+def new_session_with_our_user_agent(*, path: pathlib.Path) -> Iterator['requests.Session']:
+    import http.cookiejar  # pylint: disable=import-outside-toplevel
+
+    import requests  # pylint: disable=import-outside-toplevel
+
     session = requests.Session()
     session.headers['User-Agent'] = '{}/{} (+{})'.format(version.__package_name__, version.__version__, version.__url__)
     logger.debug('User-Agent: %s', session.headers['User-Agent'])
@@ -85,6 +104,9 @@ def textfile(s: str) -> str:  # should have trailing newline
 
 
 def exec_command(command_str: str, *, stdin: Optional[BinaryIO] = None, input: Optional[bytes] = None, timeout: Optional[float] = None, gnu_time: Optional[str] = None) -> Tuple[Dict[str, Any], subprocess.Popen]:
+    import shlex  # pylint: disable=import-outside-toplevel
+    import tempfile  # pylint: disable=import-outside-toplevel
+
     if input is not None:
         assert stdin is None
         stdin = subprocess.PIPE  # type: ignore
@@ -102,12 +124,20 @@ def exec_command(command_str: str, *, stdin: Optional[BinaryIO] = None, input: O
         begin = time.perf_counter()
 
         # We need kill processes called from the "time" command using process groups. Without this, orphans spawn. see https://github.com/kmyk/online-judge-tools/issues/640
-        preexec_fn = None
-        if gnu_time is not None and os.name == 'posix':
-            preexec_fn = os.setsid
+        start_new_session = gnu_time is not None and os.name == 'posix'
+
+        # On POSIX, subprocess starts the child with posix_spawn() instead of fork() + exec() only if the executable is given with a directory, close_fds is false, and stderr is not redirected to fd 2. This matters when many test cases are run.
+        # close_fds=False leaks nothing because file descriptors opened by Python are non-inheritable (PEP 446), and inheriting stderr is the same as passing sys.stderr unless it is replaced.
+        popen_kwargs: Dict[str, Any] = {}
+        stderr: Any = sys.stderr
+        if os.name == 'posix':
+            popen_kwargs['executable'] = shutil.which(command[0]) or command[0]
+            popen_kwargs['close_fds'] = False
+            if sys.stderr is sys.__stderr__:
+                stderr = None
 
         try:
-            proc = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE, stderr=sys.stderr, preexec_fn=preexec_fn)  # pylint: disable=subprocess-popen-preexec-fn
+            proc = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr, start_new_session=start_new_session, **popen_kwargs)
         except FileNotFoundError:
             logger.error('No such file or directory: %s', command)
             sys.exit(1)
@@ -120,7 +150,7 @@ def exec_command(command_str: str, *, stdin: Optional[BinaryIO] = None, input: O
         except subprocess.TimeoutExpired:
             pass
         finally:
-            if preexec_fn is not None:
+            if start_new_session:
                 try:
                     os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
                 except ProcessLookupError:
@@ -144,13 +174,25 @@ def exec_command(command_str: str, *, stdin: Optional[BinaryIO] = None, input: O
     return info, proc
 
 
+# Escape sequences are concatenated once here, because these functions can be called per character when diffs are printed.
+_GREEN_PREFIX = colorama.Fore.GREEN
+_RED_PREFIX = colorama.Fore.RED
+_COLOR_SUFFIX = colorama.Fore.RESET
+_GREEN_DIFF_PREFIX = colorama.Fore.RESET + colorama.Back.GREEN + colorama.Style.BRIGHT
+_GREEN_DIFF_SUFFIX = colorama.Style.NORMAL + colorama.Back.RESET + colorama.Fore.GREEN
+_RED_DIFF_PREFIX = colorama.Fore.RESET + colorama.Back.RED + colorama.Style.BRIGHT
+_RED_DIFF_SUFFIX = colorama.Style.NORMAL + colorama.Back.RESET + colorama.Fore.RED
+_SUCCESS_HEADER = colorama.Fore.GREEN + 'SUCCESS' + colorama.Style.RESET_ALL + ': '
+_FAILURE_HEADER = colorama.Fore.RED + 'FAILURE' + colorama.Style.RESET_ALL + ': '
+
+
 def green(s: str) -> str:
     """green(s) color s with green.
 
     This function exists to encapsulate the coloring methods only in utils.py.
     """
 
-    return colorama.Fore.GREEN + s + colorama.Fore.RESET
+    return f'{_GREEN_PREFIX}{s}{_COLOR_SUFFIX}'
 
 
 def red(s: str) -> str:
@@ -159,35 +201,35 @@ def red(s: str) -> str:
     This function exists to encapsulate the coloring methods only in utils.py.
     """
 
-    return colorama.Fore.RED + s + colorama.Fore.RESET
+    return f'{_RED_PREFIX}{s}{_COLOR_SUFFIX}'
 
 
 def green_diff(s: str) -> str:
     """green_diff(s) is deprecated.
     """
 
-    return colorama.Fore.RESET + colorama.Back.GREEN + colorama.Style.BRIGHT + s + colorama.Style.NORMAL + colorama.Back.RESET + colorama.Fore.GREEN
+    return f'{_GREEN_DIFF_PREFIX}{s}{_GREEN_DIFF_SUFFIX}'
 
 
 def red_diff(s: str) -> str:
     """red_diff(s) is deprecated.
     """
 
-    return colorama.Fore.RESET + colorama.Back.RED + colorama.Style.BRIGHT + s + colorama.Style.NORMAL + colorama.Back.RESET + colorama.Fore.RED
+    return f'{_RED_DIFF_PREFIX}{s}{_RED_DIFF_SUFFIX}'
 
 
 def success(msg: str) -> str:
     """success(msg) adds a header to msg for logging.
     """
 
-    return colorama.Fore.GREEN + 'SUCCESS' + colorama.Style.RESET + ': ' + msg
+    return _SUCCESS_HEADER + msg
 
 
 def failure(msg: str) -> str:
     """success(msg) adds a header to msg for logging.
     """
 
-    return colorama.Fore.RED + 'FAILURE' + colorama.Style.RESET + ': ' + msg
+    return _FAILURE_HEADER + msg
 
 
 def remove_suffix(s: str, suffix: str) -> str:
@@ -198,8 +240,12 @@ def remove_suffix(s: str, suffix: str) -> str:
 tzinfo_jst = datetime.timezone(datetime.timedelta(hours=+9), 'JST')
 
 
+# The uname is already queried at import time for default_cookie_path, so this costs nothing extra
+_IS_WSL = _uname().system == 'Linux' and 'microsoft' in _uname().release.lower()
+
+
 def is_windows_subsystem_for_linux() -> bool:
-    return platform.uname().system == 'Linux' and 'microsoft' in platform.uname().release.lower()
+    return _IS_WSL
 
 
 @functools.lru_cache(maxsize=None)
@@ -215,6 +261,7 @@ def webbrowser_register_explorer_exe() -> None:
 
     if not is_windows_subsystem_for_linux():
         return
+    import webbrowser  # pylint: disable=import-outside-toplevel
     instance = webbrowser.GenericBrowser('explorer.exe')
     webbrowser.register('explorer', None, instance, preferred=True)  # `preferred=True` solves the issue that terminal logs are cleared on cmd.exe with stopping using wslview via www-browser. TODO: remove `preferred=True` after https://github.com/wslutilities/wslu/issues/199 is fixed.
 
@@ -224,6 +271,6 @@ def get_default_command() -> str:
 
     The type of return values must be `str` and must not be `pathlib.Path`, because the strings `./a.out` and `a.out` are different as commands but same as a path.
     """
-    if platform.system() == 'Windows':
+    if _system() == 'Windows':
         return r'.\a.exe'
     return './a.out'
@@ -1,18 +1,13 @@
+import collections
+import functools
+import importlib.util
 import os
 import sys
 import time
 from typing import Dict, List, Optional, Tuple, Any
 
-try:
-    from rich.console import Console
-    from rich.table import Table
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-    from rich.syntax import Syntax
-    from rich.text import Text
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+# rich is imported on first use in _get_rich(), because importing it takes a large part of the startup time of every command
+RICH_AVAILABLE = importlib.util.find_spec('rich') is not None
 
 # Fallback functions for when rich is not available
 def _print_header(text: str) -> None:
@@ -33,101 +28,159 @@ def _print_info(text: str) -> None:
     """Print an info message without rich."""
     print(f"ℹ {text}")
 
-def _print_table(headers: List[str], rows: List[List[str]]) -> None:
-    """Print a table without rich."""
-    # Calculate column widths
-    col_widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(str(cell)))
-    
-    # Print headers
-    header_row = " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers))
-    print(header_row)
-    print("-" * len(header_row))
+def _print_warning(text: str) -> None:
+    """Print a warning message without rich."""
+    print(f"⚠ {text}")
+
+def _format_table(headers: List[str], rows: List[List[Any]]) -> List[str]:
+    """Format a table as lines without rich."""
+    # Convert cells to strings once. Widths are calculated for each header, because a row may have fewer cells than the headers
+    str_rows = [[str(cell) for cell in row] for row in rows]
+    col_widths = [max([len(h)] + [len(row[i]) for row in str_rows if i < len(row)]) for i, h in enumerate(headers)]
     
-    # Print rows
-    for row in rows:
-        print(" | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row)))
+    # Build headers and rows, padding only the cells which each row has
+    header_row = " | ".join(h.ljust(width) for h, width in zip(headers, col_widths))
+    lines = [header_row, "-" * len(header_row)]
+    lines.extend(" | ".join(cell.ljust(width) for cell, width in zip(row, col_widths)) for row in str_rows)
+    return lines
+
+def _write_lines(lines: List[str]) -> None:
+    """Write lines to stdout with a single write, instead of a print() for each line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def _print_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Print a table without rich."""
+    _write_lines(_format_table(headers, rows))
 
-def _print_code(code: str, language: str) -> None:
+def _print_code(code: str, language: str = "python") -> None:
     """Print code without rich."""
-    print(f"\n--- {language} ---")
-    print(code)
-    print("---")
+    _write_lines(["", f"--- {language} ---", code, "---"])
 
-# Rich-enabled functions
-console = Console() if RICH_AVAILABLE else None
+# Styles of statuses in result tables. print_test_results shows other statuses in yellow, and print_compare_results shows them in red.
+_STATUS_STYLE = {
+    'AC': "bold green",
+    'WA': "bold red",
+    'TLE': "bold red",
+    'RE': "bold red",
+}
+
+# Rich is used only for terminals. When stdout is redirected, e.g. in CI, the plain functions are used, because the styles would be stripped anyway.
+_USE_RICH = RICH_AVAILABLE and sys.stdout.isatty()
+
+_Rich = collections.namedtuple('_Rich', ['console', 'Group', 'Panel', 'Table', 'Text'])
+
+@functools.lru_cache(maxsize=None)
+def _get_rich() -> _Rich:
+    """Import the commonly used parts of rich and create the console.
 
-def print_header(text: str) -> None:
+    The highlighter of the console is disabled, because it runs regular expressions over every printed string.
+    """
+    from rich.console import Console, Group  # pylint: disable=import-outside-toplevel
+    from rich.panel import Panel  # pylint: disable=import-outside-toplevel
+    from rich.table import Table  # pylint: disable=import-outside-toplevel
+    from rich.text import Text  # pylint: disable=import-outside-toplevel
+    return _Rich(console=Console(highlight=False), Group=Group, Panel=Panel, Table=Table, Text=Text)
+
+def __getattr__(name: str) -> Any:
+    # `console` is still available as a module attribute, although it is created on first use now
+    if name == 'console':
+        return _get_rich().console if _USE_RICH else None
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Rich-enabled functions
+def _rich_print_header(text: str) -> None:
     """Print a styled header."""
-    if RICH_AVAILABLE:
-        console.print(Panel(text, style="bold blue"))
-    else:
-        _print_header(text)
+    rich = _get_rich()
+    rich.console.print(rich.Panel(text, style="bold blue"))
 
-def print_success(text: str) -> None:
+def _rich_print_success(text: str) -> None:
     """Print a success message."""
-    if RICH_AVAILABLE:
-        console.print(f"[bold green]✓[/bold green] {text}")
-    else:
-        _print_success(text)
+    _get_rich().console.print(f"[bold green]✓[/bold green] {text}")
 
-def print_error(text: str) -> None:
+def _rich_print_error(text: str) -> None:
     """Print an error message."""
-    if RICH_AVAILABLE:
-        console.print(f"[bold red]✗[/bold red] {text}")
-    else:
-        _print_error(text)
+    _get_rich().console.print(f"[bold red]✗[/bold red] {text}")
 
-def print_info(text: str) -> None:
+def _rich_print_info(text: str) -> None:
     """Print an info message."""
-    if RICH_AVAILABLE:
-        console.print(f"[bold blue]ℹ[/bold blue] {text}")
-    else:
-        _print_info(text)
+    _get_rich().console.print(f"[bold blue]ℹ[/bold blue] {text}")
 
-def print_warning(text: str) -> None:
+def _rich_print_warning(text: str) -> None:
     """Print a warning message."""
-    if RICH_AVAILABLE:
-        console.print(f"[bold yellow]⚠[/bold yellow] {text}")
-    else:
-        print(f"⚠ {text}")
+    _get_rich().console.print(f"[bold yellow]⚠[/bold yellow] {text}")
+
+def _make_table(headers: List[str]) -> Any:
+    """Create an empty rich table with the given columns.
+
+    Tables are not cached and copied, because a copied Table shares its columns, and so its cells, with the original.
+    """
+    table = _get_rich().Table(show_header=True, header_style="bold")
+    for header in headers:
+        table.add_column(header)
+    return table
 
-def print_table(headers: List[str], rows: List[List[Any]]) -> None:
+def _rich_print_table(headers: List[str], rows: List[List[Any]]) -> None:
     """Print a styled table."""
-    if RICH_AVAILABLE:
-        table = Table(show_header=True, header_style="bold")
-        for header in headers:
-            table.add_column(header)
-        
-        for row in rows:
-            table.add_row(*[str(cell) for cell in row])
-        
-        console.print(table)
-    else:
-        _print_table(headers, rows)
+    table = _make_table(headers)
+    add_row = table.add_row
+    
+    for row in rows:
+        add_row(*[str(cell) for cell in row])
+    
+    _get_rich().console.print(table)
 
-def print_code(code: str, language: str = "python") -> None:
+def _rich_print_code(code: str, language: str = "python") -> None:
     """Print syntax-highlighted code."""
-    if RICH_AVAILABLE:
-        syntax = Syntax(code, language, theme="monokai", line_numbers=True)
-        console.print(syntax)
-    else:
+    # Lexing with pygments is slow, so it is skipped also when stdout has been redirected after this module was imported
+    if not sys.stdout.isatty():
         _print_code(code, language)
+        return
+    # rich.syntax is imported only here, because it imports pygments
+    from rich.syntax import Syntax  # pylint: disable=import-outside-toplevel
+    syntax = Syntax(code, language, theme="monokai", line_numbers=True)
+    _get_rich().console.print(syntax)
 
-def create_progress() -> Any:
+@functools.lru_cache(maxsize=None)
+def _progress_columns() -> Tuple[Any, ...]:
+    """Create the columns of progress bars once. They can be shared, because progress bars are used one at a time."""
+    from rich.progress import BarColumn, SpinnerColumn, TextColumn, TimeElapsedColumn  # pylint: disable=import-outside-toplevel
+    return (
+        SpinnerColumn(),
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(),
+        TextColumn("[bold]{task.completed}/{task.total}"),
+        TimeElapsedColumn(),
+    )
+
+def _rich_create_progress() -> Any:
     """Create a progress bar."""
-    if RICH_AVAILABLE:
-        return Progress(
-            SpinnerColumn(),
-            TextColumn("[bold blue]{task.description}"),
-            BarColumn(),
-            TextColumn("[bold]{task.completed}/{task.total}"),
-            TimeElapsedColumn(),
-        )
-    else:
-        return None
+    from rich.progress import Progress  # pylint: disable=import-outside-toplevel
+    return Progress(*_progress_columns())
+
+def _create_progress() -> Any:
+    """Return None, because progress bars are shown only with rich."""
+    return None
+
+# The public functions are bound to the rich or the plain implementations once here, instead of checking _USE_RICH in every call
+if _USE_RICH:
+    print_header = _rich_print_header
+    print_success = _rich_print_success
+    print_error = _rich_print_error
+    print_info = _rich_print_info
+    print_warning = _rich_print_warning
+    print_table = _rich_print_table
+    print_code = _rich_print_code
+    create_progress = _rich_create_progress
+else:
+    print_header = _print_header
+    print_success = _print_success
+    print_error = _print_error
+    print_info = _print_info
+    print_warning = _print_warning
+    print_table = _print_table
+    print_code = _print_code
+    create_progress = _create_progress
 
 def print_test_results(test_results: List[Dict[str, Any]]) -> None:
     """
@@ -145,64 +198,48 @@ def print_test_results(test_results: List[Dict[str, Any]]) -> None:
         return
     
     headers = ["Test", "Status", "Time (s)", "Memory (MB)"]
-    rows = []
+    ac_count = 0  # counted in the loop below
+    total_count = len(test_results)
+    
+    rows: List[List[Any]] = []  # only for the plain table
+    get_status_style = _STATUS_STYLE.get
+    if _USE_RICH:
+        rich = _get_rich()
+        Text = rich.Text
+        table = _make_table(headers)
+        add_row = table.add_row  # bound once outside of the loop
     
+    # Rows are built and styled in a single pass over the results
     for result in test_results:
         status = result.get('status', 'N/A')
-        status_str = status
-        
-        # Format row data
-        row = [
-            result.get('test_name', 'Unknown'),
-            status_str,
-            f"{result.get('time', 0):.6f}",
-            f"{result.get('memory', 'N/A')}" if result.get('memory') is not None else 'N/A'
-        ]
-        rows.append(row)
-    
-    if RICH_AVAILABLE:
-        table = Table(show_header=True, header_style="bold")
-        for header in headers:
-            table.add_column(header)
-        
-        for i, row in enumerate(rows):
-            status = test_results[i].get('status', 'N/A')
-            
-            # Style based on status
-            if status == 'AC':
-                status_style = "bold green"
-            elif status in ['WA', 'TLE', 'RE']:
-                status_style = "bold red"
-            else:
-                status_style = "bold yellow"
-            
-            styled_row = [
-                row[0],
-                f"[{status_style}]{row[1]}[/{status_style}]",
-                row[2],
-                row[3]
-            ]
-            
-            table.add_row(*styled_row)
+        if status == 'AC':
+            ac_count += 1
+        memory = result.get('memory')
+        time_str = f"{result.get('time', 0):.6f}"
+        memory_str = f"{memory}" if memory is not None else 'N/A'
         
-        console.print(table)
-    else:
-        _print_table(headers, rows)
-    
-    # Print summary
-    ac_count = sum(1 for r in test_results if r.get('status') == 'AC')
-    total_count = len(test_results)
+        if _USE_RICH:
+            # Test names are wrapped in Text, so that brackets in them are printed as they are instead of being parsed as markup
+            add_row(Text(str(result.get('test_name', 'Unknown'))), Text(status, style=get_status_style(status, "bold yellow")), time_str, memory_str)
+        else:
+            rows.append([result.get('test_name', 'Unknown'), status, time_str, memory_str])
     
-    if RICH_AVAILABLE:
+    if _USE_RICH:
+        # The table and the summary are rendered with a single print
         if ac_count == total_count:
-            console.print(f"\n[bold green]All tests passed! {ac_count}/{total_count}[/bold green]")
+            summary = Text(f"\nAll tests passed! {ac_count}/{total_count}", style="bold green")
         else:
-            console.print(f"\n[bold yellow]Tests passed: {ac_count}/{total_count}[/bold yellow]")
+            summary = Text(f"\nTests passed: {ac_count}/{total_count}", style="bold yellow")
+        rich.console.print(rich.Group(table, summary))
     else:
+        # The table and the summary are written at once
+        lines = _format_table(headers, rows)
+        lines.append("")
         if ac_count == total_count:
-            print(f"\nAll tests passed! {ac_count}/{total_count}")
+            lines.append(f"All tests passed! {ac_count}/{total_count}")
         else:
-            print(f"\nTests passed: {ac_count}/{total_count}")
+            lines.append(f"Tests passed: {ac_count}/{total_count}")
+        _write_lines(lines)
 
 def print_compare_results(compare_results: List[Dict[str, Any]]) -> None:
     """
@@ -228,131 +265,85 @@ def print_compare_results(compare_results: List[Dict[str, Any]]) -> None:
     if has_status:
         headers = ["Test", "Result", "Std Status", "Force Status", "Std Time (s)", "Force Time (s)", "Speedup"]
     
-    rows = []
+    match_count = 0  # counted in the loop below
+    total_count = len(compare_results)
+    
+    rows: List[List[Any]] = []  # only for the plain table
+    get_status_style = _STATUS_STYLE.get
+    if _USE_RICH:
+        rich = _get_rich()
+        Text = rich.Text
+        table = _make_table(headers)
+        add_row = table.add_row  # bound once outside of the loop
     
+    # Rows are built and styled in a single pass over the results
     for result in compare_results:
         match = result.get('match', False)
+        if match:
+            match_count += 1
         std_time = result.get('std_time', 0)
         force_time = result.get('force_time', 0)
         
-        # Calculate speedup
+        # Calculate speedup, and its style at the same time
+        speedup_style: Optional[str] = None
         if force_time > 0 and std_time > 0:
             speedup = std_time / force_time
             speedup_str = f"{speedup:.2f}x"
+            if speedup > 1:
+                speedup_style = "bold green"
+            elif speedup < 1:
+                speedup_style = "bold red"
+            else:
+                speedup_style = "bold white"
         else:
             speedup_str = "N/A"
         
         # Format row data
+        row: List[Any] = [
+            result.get('test_id', 'Unknown'),
+            "Match" if match else "Mismatch",
+        ]
         if has_status:
-            std_status = result.get('std_status', 'N/A')
-            force_status = result.get('force_status', 'N/A')
-            row = [
-                result.get('test_id', 'Unknown'),
-                "Match" if match else "Mismatch",
-                std_status,
-                force_status,
-                f"{std_time:.6f}",
-                f"{force_time:.6f}",
-                speedup_str
-            ]
-        else:
-            row = [
-                result.get('test_id', 'Unknown'),
-                "Match" if match else "Mismatch",
-                f"{std_time:.6f}",
-                f"{force_time:.6f}",
-                speedup_str
-            ]
-        rows.append(row)
-    
-    if RICH_AVAILABLE:
-        table = Table(show_header=True, header_style="bold")
-        for header in headers:
-            table.add_column(header)
+            row.append(result.get('std_status', 'N/A'))
+            row.append(result.get('force_status', 'N/A'))
+        row.append(f"{std_time:.6f}")
+        row.append(f"{force_time:.6f}")
+        row.append(speedup_str)
         
-        for i, row in enumerate(rows):
-            match = compare_results[i].get('match', False)
-            
-            # Style based on match status
-            result_style = "bold green" if match else "bold red"
-            result_text = f"[{result_style}]{row[1]}[/{result_style}]"
-            
-            # Style status if available
-            if has_status:
-                std_status = compare_results[i].get('std_status', 'N/A')
-                force_status = compare_results[i].get('force_status', 'N/A')
-                
-                std_status_style = "bold green" if std_status == 'AC' else "bold red"
-                force_status_style = "bold green" if force_status == 'AC' else "bold red"
-                
-                std_status_text = f"[{std_status_style}]{row[2]}[/{std_status_style}]"
-                force_status_text = f"[{force_status_style}]{row[3]}[/{force_status_style}]"
-                
-                # Style speedup
-                std_time = compare_results[i].get('std_time', 0)
-                force_time = compare_results[i].get('force_time', 0)
-                if force_time > 0 and std_time > 0:
-                    speedup = std_time / force_time
-                    if speedup > 1:
-                        speedup_style = "bold green"
-                    elif speedup < 1:
-                        speedup_style = "bold red"
-                    else:
-                        speedup_style = "bold white"
-                    speedup_text = f"[{speedup_style}]{row[6]}[/{speedup_style}]"
-                else:
-                    speedup_text = row[6]
-                
-                styled_row = [
-                    row[0],
-                    result_text,
-                    std_status_text,
-                    force_status_text,
-                    row[4],
-                    row[5],
-                    speedup_text
-                ]
-            else:
-                # Style speedup
-                std_time = compare_results[i].get('std_time', 0)
-                force_time = compare_results[i].get('force_time', 0)
-                if force_time > 0 and std_time > 0:
-                    speedup = std_time / force_time
-                    if speedup > 1:
-                        speedup_style = "bold green"
-                    elif speedup < 1:
-                        speedup_style = "bold red"
-                    else:
-                        speedup_style = "bold white"
-                    speedup_text = f"[{speedup_style}]{row[4]}[/{speedup_style}]"
-                else:
-                    speedup_text = row[4]
-                
-                styled_row = [
-                    row[0],
-                    result_text,
-                    row[2],
-                    row[3],
-                    speedup_text
-                ]
-            
-            table.add_row(*styled_row)
+        if not _USE_RICH:
+            rows.append(row)
+            continue
         
-        console.print(table)
-    else:
-        _print_table(headers, rows)
-    
-    # Print summary
-    match_count = sum(1 for r in compare_results if r.get('match', False))
-    total_count = len(compare_results)
+        # Test IDs are wrapped in Text, so that brackets in them are not parsed as markup
+        row[0] = Text(str(row[0]))
+        
+        # Style based on match status
+        row[1] = Text(row[1], style="bold green" if match else "bold red")
+        
+        # Style status if available
+        if has_status:
+            row[2] = Text(row[2], style=get_status_style(row[2], "bold red"))
+            row[3] = Text(row[3], style=get_status_style(row[3], "bold red"))
+        
+        # Style speedup
+        if speedup_style is not None:
+            row[-1] = Text(speedup_str, style=speedup_style)
+        
+        add_row(*row)
     
-    if RICH_AVAILABLE:
+    if _USE_RICH:
+        # The table and the summary are rendered with a single print
         if match_count == total_count:
-            console.print(f"\n[bold green]All outputs match! {match_count}/{total_count}[/bold green]")
+            summary = Text(f"\nAll outputs match! {match_count}/{total_count}", style="bold green")
         else:
-            console.print(f"\n[bold red]Outputs match: {match_count}/{total_count}[/bold red]")
+            summary = Text(f"\nOutputs match: {match_count}/{total_count}", style="bold red")
+        rich.console.print(rich.Group(table, summary))
     else:
+        # The table and the summary are written at once
+        lines = _format_table(headers, rows)
+        lines.append("")
         if match_count == total_count:
-            print(f"\nAll outputs match! {match_count}/{total_count}")
+            lines.append(f"All outputs match! {match_count}/{total_count}")
         else:
-            print(f"\nOutputs match: {match_count}/{total_count}") 
\ No newline at end of file
+            lines.append(f"Outputs match: {match_count}/{total_count}")
+        _write_lines(lines) 
\ No newline at end of file
@@ -0,0 +1,196 @@
+import pathlib
+import sys
+import textwrap
+import unittest
+
+import tests.utils
+from onlinejudge_command import main
+from onlinejudge_command.subcommand import validator
+
+# a validator which accepts test files containing a single number, with the batch protocol
+BATCH_VALIDATOR = textwrap.dedent("""\
+    import sys
+
+    stdin = sys.stdin.buffer
+    while True:
+        header = stdin.readline()
+        if not header:
+            break
+        _, name, size = header.decode().split()
+        data = stdin.read(int(size))
+        if data.strip().isdigit():
+            print('OK', name)
+        else:
+            print('FAIL', name, 'not a number')
+    """)
+
+# a validator which reports a case which does not exist, and nothing for the other cases
+WRONG_NAME_VALIDATOR = textwrap.dedent("""\
+    import sys
+
+    sys.stdin.buffer.read()
+    print('OK sample/a.in')
+    print('OK sample/typo.in')
+    """)
+
+SINGLE_VALIDATOR = textwrap.dedent("""\
+    import sys
+
+    sys.exit(0 if sys.stdin.read().strip().isdigit() else 1)
+    """)
+
+
+def run_validator(args):
+    parsed = main.get_parser().parse_args(['v'] + args)
+    return validator.run(parsed)
+
+
+class ValidateBatchTest(unittest.TestCase):
+    def test_round_trip(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/sample/b c.in',
+                'data': 'x\n'
+            },
+            {
+                'path': 'data/secret/d.in',
+                'data': '2\n'
+            },
+            {
+                'path': 'validate.py',
+                'data': BATCH_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            test_files = [
+                ('sample', pathlib.Path('data/sample/a.in')),
+                ('sample', pathlib.Path('data/sample/b c.in')),
+                ('secret', pathlib.Path('data/secret/d.in')),
+            ]
+            results = validator._validate_batch([sys.executable, 'validate.py'], test_files, lambda test_file: None)  # pylint: disable=protected-access
+        self.assertEqual([(result['name'], result['is_valid']) for result in results], [('a.in', True), ('b c.in', False), ('d.in', True)])
+        self.assertEqual(results[1]['error'], 'not a number')
+
+    def test_missing_and_unknown_reports(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/sample/b.in',
+                'data': '2\n'
+            },
+            {
+                'path': 'validate.py',
+                'data': WRONG_NAME_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            test_files = [
+                ('sample', pathlib.Path('data/sample/a.in')),
+                ('sample', pathlib.Path('data/sample/b.in')),
+            ]
+            results = validator._validate_batch([sys.executable, 'validate.py'], test_files, lambda test_file: None)  # pylint: disable=protected-access
+        self.assertEqual([result['is_valid'] for result in results], [True, False])
+        self.assertEqual(results[1]['error'], 'no result was reported by the validator')
+
+
+class ValidatorTest(unittest.TestCase):
+    def test_batch(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/sample/b.in',
+                'data': '2\n'
+            },
+            {
+                'path': 'input_validators/validate.py',
+                'data': WRONG_NAME_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            self.assertFalse(run_validator(['--batch']))
+
+    def test_several_validators(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/sample/b.in',
+                'data': '2\n'
+            },
+            {
+                'path': 'data/secret/c.in',
+                'data': '3\n'
+            },
+            {
+                'path': 'input_validators/batch.py',
+                'data': '# oj-batch: 1\n' + BATCH_VALIDATOR
+            },
+            {
+                'path': 'input_validators/single.py',
+                'data': SINGLE_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            self.assertTrue(run_validator([]))
+            self.assertTrue(run_validator(['-j', '1']))
+
+    def test_summary_only_with_jobs(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/secret/b.in',
+                'data': 'x\n'
+            },
+            {
+                'path': 'input_validators/validate.py',
+                'data': SINGLE_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            self.assertFalse(run_validator(['--summary-only', '-j', '2']))
+            self.assertTrue(run_validator(['--summary-only', '-j', '2', '--only-sample']))
+
+    def test_limit(self):
+        files = [
+            {
+                'path': 'data/sample/a.in',
+                'data': '1\n'
+            },
+            {
+                'path': 'data/sample/b.in',
+                'data': 'x\n'
+            },
+            {
+                'path': 'input_validators/validate.py',
+                'data': SINGLE_VALIDATOR
+            },
+        ]
+        with tests.utils.sandbox(files):
+            self.assertTrue(run_validator(['--limit', '1']))
+            self.assertFalse(run_validator(['--limit', '2']))
+
+    def test_negative_limit(self):
+        with self.assertRaises(SystemExit) as e:
+            main.main(['v', '--limit', '-1'])
+        self.assertEqual(e.exception.code, 2)
+
+    def test_non_positive_jobs(self):
+        for jobs in ('0', '-3'):
+            with self.assertRaises(SystemExit) as e:
+                main.main(['v', '-j', jobs])
+            self.assertEqual(e.exception.code, 2)
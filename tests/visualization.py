@@ -0,0 +1,14 @@
+import unittest
+
+from onlinejudge_command import visualization
+
+
+class FormatTableTest(unittest.TestCase):
+    def test_format_table(self):
+        self.assertEqual(visualization._format_table(['X', 'Y'], [['a', 'bb'], [1, 2]]), ['X | Y ', '------', 'a | bb', '1 | 2 '])  # pylint: disable=protected-access
+
+    def test_short_row(self):
+        self.assertEqual(visualization._format_table(['X', 'Y', 'Z'], [['a', 'b', 'c'], ['d', 'e']]), ['X | Y | Z', '---------', 'a | b | c', 'd | e'])  # pylint: disable=protected-access
+
+    def test_no_rows(self):
+        self.assertEqual(visualization._format_table(['X', 'Y'], []), ['X | Y', '-----'])  # pylint: disable=protected-access